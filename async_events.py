@@ -0,0 +1,74 @@
+import asyncio
+import concurrent.futures
+
+from events import BLOCK, DROP_OLDEST, Subscription
+
+class AsyncSubscription(Subscription):
+    """Queues events into an asyncio.Queue consumed by a task on `loop`.
+
+    `handler` may be a plain function or a coroutine function.
+    """
+
+    def __init__(self, handler, loop, event_types=None, maxsize=1000, overflow=BLOCK, block_timeout=1.0):
+        super().__init__(handler, event_types)
+        self.loop = loop
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._queue = asyncio.Queue(maxsize)
+        self._consumer = asyncio.run_coroutine_threadsafe(self._consume(), loop)
+
+    async def _consume(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                result = self.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.delivered += 1
+            except Exception:
+                self.errors += 1
+            finally:
+                self._queue.task_done()
+
+    def _in_loop_thread(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _put_nowait(self, event):
+        # Runs on the loop thread, so the queue is never touched concurrently
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except asyncio.QueueFull:
+                if self.overflow != DROP_OLDEST:
+                    self.dropped += 1
+                    return
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+
+    def offer(self, event):
+        if self._in_loop_thread():
+            # Blocking here would deadlock the loop; fall back to the non-blocking policy
+            self._put_nowait(event)
+        elif self.overflow == BLOCK:
+            future = asyncio.run_coroutine_threadsafe(self._queue.put(event), self.loop)
+            try:
+                future.result(self.block_timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                self.dropped += 1
+        else:
+            self.loop.call_soon_threadsafe(self._put_nowait, event)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    async def drain(self):
+        await self._queue.join()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self._consumer.cancel)
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+class AvailabilityCache:
+    """Size-bounded LRU cache with TTL for availability and rate queries.
+
+    Entries are tagged with the room type they cover (None = every type), so a
+    room changing state drops only the answers for its own type plus the
+    all-types answers. The TTL is a safety net for changes made outside the
+    hotel systems' own methods.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._tags = {}                # room type -> keys cached for it
+        self._generations = {}         # room type -> invalidation counter
+        self._epoch = 0                # bumped by clear()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._tags.get(key[1], set()).discard(key)
+
+    def get(self, kind, room_type, start, end, compute):
+        """Return the cached answer for the query, calling compute() on a miss."""
+        key = (kind, room_type, start, end)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._drop(key)
+                self.expirations += 1
+            self.misses += 1
+            generation = (self._epoch, self._generations.get(room_type, 0))
+
+        value = tuple(compute())
+
+        with self._lock:
+            # Skip storing if the rooms changed while we were computing
+            if generation == (self._epoch, self._generations.get(room_type, 0)):
+                self._entries[key] = (self._clock() + self.ttl, value)
+                self._entries.move_to_end(key)
+                self._tags.setdefault(room_type, set()).add(key)
+                while len(self._entries) > self.maxsize:
+                    oldest = next(iter(self._entries))
+                    self._drop(oldest)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, room_type):
+        """Forget answers for `room_type` and the all-types answers."""
+        with self._lock:
+            for tag in {room_type, None}:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                keys = self._tags.pop(tag, set())
+                for key in keys:
+                    self._entries.pop(key, None)
+                self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,168 @@
+from itertools import count
+
+# Room types from cheapest to most spacious; upgrades only move right
+UPGRADE_ORDER = ["Standard", "Deluxe", "Suite"]
+
+class GroupRequest:
+    def __init__(self, name, room_type, party_size=1, group=None, special_requests=None):
+        self.name = name
+        self.room_type = getattr(room_type, "value", room_type)  # RoomType or its string value
+        self.party_size = party_size
+        self.group = group
+        self.special_requests = list(special_requests or [])
+
+class Assignment:
+    def __init__(self, request, room_number, room_type, granted, denied):
+        self.request = request
+        self.room_number = room_number
+        self.room_type = room_type
+        self.granted = granted
+        self.denied = denied
+
+    @property
+    def upgraded(self):
+        return self.room_type != self.request.room_type
+
+class BatchResult:
+    def __init__(self):
+        self.assignments = []
+        self.unassigned = []    # list of (request, reason)
+        self.split_groups = 0   # groups spread over more than one block of adjacent rooms
+
+    def summary(self):
+        upgrades = sum(1 for a in self.assignments if a.upgraded)
+        return (f"Assigned {len(self.assignments)}, unassigned {len(self.unassigned)}, "
+                f"upgraded {upgrades}, split groups {self.split_groups}")
+
+class BatchAssigner:
+    """Places many guests at once with a greedy-with-repair strategy.
+
+    Groups are placed largest first, each in its requested room type. A group
+    takes the tightest block of adjacent free rooms (consecutive room numbers)
+    that holds all of it, so big blocks survive for big groups. When no single
+    block is large enough the group is repaired across the fewest, largest
+    blocks. Upgrades are handed out in a second pass, only to guests still
+    without a room, so they never take rooms that exact-type bookings needed.
+    """
+
+    def __init__(self, hotel_system, allow_upgrades=True):
+        self.hotel_system = hotel_system
+        self.allow_upgrades = allow_upgrades
+
+    def _free_blocks(self):
+        blocks = {t: [] for t in UPGRADE_ORDER}
+        capacity = {}
+        previous = None
+        for number in sorted(self.hotel_system.rooms):
+            room = self.hotel_system.rooms[number]
+            if not room.is_available():
+                previous = None
+                continue
+            room_type = room.room_type.value
+            capacity[room_type] = min(capacity.get(room_type, room.capacity), room.capacity)
+            if previous is not None and previous == (number - 1, room_type):
+                blocks[room_type][-1].append(number)
+            else:
+                blocks.setdefault(room_type, []).append([number])
+            previous = (number, room_type)
+        return blocks, capacity
+
+    @staticmethod
+    def _take(blocks, k):
+        """Remove up to k rooms from `blocks`; returns (rooms, number of blocks used)."""
+        fitting = [b for b in blocks if len(b) >= k]
+        if fitting:
+            block = min(fitting, key=len)
+            rooms = block[:k]
+            del block[:k]
+            if not block:
+                blocks.remove(block)
+            return rooms, 1
+        rooms, used = [], 0
+        for block in sorted(blocks, key=len, reverse=True):
+            take = block[:k - len(rooms)]
+            rooms.extend(take)
+            del block[:len(take)]
+            used += 1
+            if len(rooms) == k:
+                break
+        blocks[:] = [b for b in blocks if b]
+        return rooms, used
+
+    def _resolve_requests(self, request, stock):
+        """Reserve inventory for one guest; returns (target type, party size needing beds, granted, denied)."""
+        target, needed = request.room_type, request.party_size
+        granted, denied = [], []
+        for item in request.special_requests:
+            if stock.get(item, 0) > 0:
+                stock[item] -= 1
+                granted.append(item)
+                if item == "suite upgrade":
+                    target = "Suite"
+                elif item == "extra bed":
+                    needed -= 1
+            else:
+                denied.append(item)
+        return target, needed, granted, denied
+
+    def _place(self, result, members, room_type, blocks, capacity):
+        """Put as many of `members` as fit into `room_type`; returns (the rest, blocks used)."""
+        fits = [m for m in members if m[1] <= capacity.get(room_type, 0)]
+        if not fits:
+            return members, 0
+        rooms, used = self._take(blocks[room_type], len(fits))
+        for (request, _, granted, denied), number in zip(fits, rooms):
+            result.assignments.append(Assignment(request, number, room_type, granted, denied))
+        placed = {id(m[0]) for m in fits[:len(rooms)]}
+        return [m for m in members if id(m[0]) not in placed], used
+
+    def plan(self, requests):
+        """Work out assignments without changing any room or inventory."""
+        result = BatchResult()
+        blocks, capacity = self._free_blocks()
+        inventory = self.hotel_system.inventory
+        stock = {item: inventory.count(item) for item in inventory.options()}
+
+        # Bucket guests by group and target type; ungrouped guests are their own group
+        solo = count()
+        buckets = {}
+        for request in requests:
+            if request.room_type not in UPGRADE_ORDER:
+                result.unassigned.append((request, f"Unknown room type: {request.room_type}"))
+                continue
+            target, needed, granted, denied = self._resolve_requests(request, stock)
+            key = (request.group if request.group is not None else ("solo", next(solo)), target)
+            buckets.setdefault(key, []).append((request, needed, granted, denied))
+
+        # First pass: every group in the type it asked for
+        pending = []
+        for (_, target), members in sorted(buckets.items(), key=lambda kv: -len(kv[1])):
+            members, blocks_used = self._place(result, members, target, blocks, capacity)
+            pending.append((target, members, blocks_used))
+
+        # Second pass: upgrade whoever is left into the higher types still free
+        for target, members, blocks_used in pending:
+            if self.allow_upgrades:
+                for room_type in UPGRADE_ORDER[UPGRADE_ORDER.index(target) + 1:]:
+                    if not members:
+                        break
+                    members, used = self._place(result, members, room_type, blocks, capacity)
+                    blocks_used += used
+            if blocks_used > 1:
+                result.split_groups += 1
+            for request, _, granted, _ in members:
+                # Give back inventory held for guests who didn't get a room
+                for item in granted:
+                    stock[item] += 1
+                result.unassigned.append((request, "No available room of the requested type and capacity"))
+        return result
+
+    def assign(self, requests, timestamp=None):
+        """Plan and apply: occupy the rooms and allocate the granted inventory."""
+        result = self.plan(requests)
+        for assignment in result.assignments:
+            room = self.hotel_system.rooms[assignment.room_number]
+            self.hotel_system.occupy_room(room, assignment.request.name, timestamp)
+            for item in assignment.granted:
+                self.hotel_system.allocate_request(item, timestamp)
+        return result
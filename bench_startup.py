@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+TARGET_MS = 100
+
+# Run in a fresh interpreter so nothing is already imported or cached
+CHILD = """
+import sys, time
+t0 = time.perf_counter()
+from index import IntegratedHotelSystem
+system = IntegratedHotelSystem(sys.argv[1])
+system.auth_system.users
+t1 = time.perf_counter()
+system.hotel_system.rooms.find(sys.argv[2])
+system.reservation_system.room_status
+t2 = time.perf_counter()
+if sys.argv[3] == "1":
+    sum(1 for _ in system.hotel_system.rooms)
+t3 = time.perf_counter()
+print((t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000)
+"""
+
+def write_config(path, rooms):
+    """Range-encoded config with `rooms` front-desk and service rooms split 50/35/15.
+
+    Returns the first room number. Each type gets its own leading digit.
+    """
+    base = 10 ** len(str(rooms))
+    counts = [rooms // 2, rooms * 35 // 100]
+    counts.append(rooms - sum(counts))
+    types = [("Standard", 17000), ("Deluxe", 26000), ("Suite", 35000)]
+    config = {
+        "room_blocks": [{"type": t, "price": p, "first": base * (i + 1), "count": n}
+                        for i, ((t, p), n) in enumerate(zip(types, counts))],
+        "service_room_blocks": [{"type": t, "first": base * (i + 1), "count": n}
+                                for i, ((t, _), n) in enumerate(zip(types, counts))],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return base
+
+def run(rooms=20000, repeats=5, materialize=False):
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        config = os.path.join(tmp, "hotel_config.json")
+        first_room = write_config(config, rooms)
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            out = subprocess.run([sys.executable, "-c", CHILD, config, str(first_room), "1" if materialize else "0"],
+                                 cwd=here, capture_output=True, text=True, check=True).stdout
+            process_ms = (time.perf_counter() - start) * 1000
+            samples.append([float(x) for x in out.split()] + [process_ms])
+    # Median of each column
+    return [sorted(column)[len(column) // 2] for column in zip(*samples)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure time from process start to the first login prompt.")
+    parser.add_argument("--rooms", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--materialize", action="store_true", help="also time building every Room")
+    args = parser.parse_args()
+
+    login_ms, first_room_ms, all_rooms_ms, process_ms = run(args.rooms, args.repeats, args.materialize)
+    print(f"Rooms configured:        {args.rooms:,}")
+    print(f"Import + ready to login: {login_ms:.1f} ms")
+    print(f"First room lookup:       {first_room_ms:.1f} ms")
+    if args.materialize:
+        print(f"Building every room:     {all_rooms_ms:.1f} ms")
+    print(f"Whole process:           {process_ms:.1f} ms (includes interpreter start/exit)")
+    print(f"{'PASS' if login_ms < TARGET_MS else 'FAIL'}: first login ready in under {TARGET_MS} ms")
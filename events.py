@@ -0,0 +1,148 @@
+import queue
+import threading
+from datetime import datetime
+from enum import Enum
+
+class EventType(Enum):
+    GUEST_REGISTERED = "guest_registered"
+    CHECK_IN = "check_in"
+    CHECK_OUT = "check_out"
+    ROOM_STATUS_CHANGED = "room_status_changed"
+    CLEANING_DONE = "cleaning_done"
+    SERVICE_DONE = "service_done"
+    INVENTORY_ALLOCATED = "inventory_allocated"
+
+class Event:
+    __slots__ = ("type", "timestamp", "data")
+
+    def __init__(self, event_type, data=None, timestamp=None):
+        self.type = event_type
+        self.timestamp = timestamp or datetime.now()
+        self.data = data or {}
+
+    def __repr__(self):
+        return f"Event({self.type.name}, {self.timestamp:%Y-%m-%d %H:%M:%S}, {self.data})"
+
+# Overflow policies for bounded subscriber queues
+BLOCK = "block"              # publisher waits (backpressure), then drops after block_timeout
+DROP_OLDEST = "drop_oldest"  # discard the oldest queued event to make room
+DROP_NEWEST = "drop_newest"  # discard the event being published
+
+class Subscription:
+    """Delivers events synchronously, in the publisher's thread."""
+
+    def __init__(self, handler, event_types=None):
+        self.handler = handler
+        self.event_types = set(event_types) if event_types else None
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def wants(self, event):
+        return self.event_types is None or event.type in self.event_types
+
+    def _call(self, event):
+        try:
+            self.handler(event)
+            self.delivered += 1
+        except Exception:
+            # A broken subscriber must never break the front desk
+            self.errors += 1
+
+    def offer(self, event):
+        self._call(event)
+
+    def close(self):
+        pass
+
+class ThreadSubscription(Subscription):
+    """Queues events in a bounded queue drained by a dedicated worker thread."""
+
+    _STOP = object()
+
+    def __init__(self, handler, event_types=None, maxsize=1000, overflow=BLOCK, block_timeout=1.0):
+        super().__init__(handler, event_types)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize)
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if event is self._STOP:
+                    return
+                self._call(event)
+            finally:
+                self._queue.task_done()
+
+    def offer(self, event):
+        if self.overflow == BLOCK:
+            try:
+                self._queue.put(event, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped += 1
+            return
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                if self.overflow == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def drain(self):
+        """Block until every queued event has been handled."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(self._STOP)
+        self._worker.join()
+
+class EventBus:
+    """In-process publish/subscribe hub for hotel state changes."""
+
+    def __init__(self):
+        self._subscriptions = []
+        self._lock = threading.Lock()
+
+    def _add(self, subscription):
+        with self._lock:
+            # Copy on write so emit() never iterates a list being modified
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def subscribe(self, handler, event_types=None):
+        return self._add(Subscription(handler, event_types))
+
+    def subscribe_threaded(self, handler, event_types=None, maxsize=1000, overflow=BLOCK, block_timeout=1.0):
+        return self._add(ThreadSubscription(handler, event_types, maxsize, overflow, block_timeout))
+
+    def subscribe_async(self, handler, loop, event_types=None, maxsize=1000, overflow=BLOCK, block_timeout=1.0):
+        # Imported here so plain publishers never pay for importing asyncio
+        from async_events import AsyncSubscription
+        return self._add(AsyncSubscription(handler, loop, event_types, maxsize, overflow, block_timeout))
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close()
+
+    def emit(self, event_type, timestamp=None, **data):
+        event = Event(event_type, data, timestamp)
+        for subscription in self._subscriptions:
+            if subscription.wants(event):
+                subscription.offer(event)
+        return event
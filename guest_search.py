@@ -0,0 +1,181 @@
+import bisect
+from collections import defaultdict
+from itertools import chain
+
+# Characters people type inside phone numbers
+_PHONE_CHARS = set("0123456789+-(). ")
+
+def _edit_distance(a, b, max_distance):
+    """Levenshtein distance, or max_distance + 1 as soon as it is known to exceed it."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+class GuestSearchIndex:
+    """Prefix and typo-tolerant lookup over guest name, email, phone and ID document.
+
+    Every term lives in a sorted list, so prefix search is a bisect plus a short
+    scan. Name terms are also kept in a trigram inverted index bucketed by term
+    length; fuzzy search only runs edit distance on terms drawn from the rarest
+    trigram lists of the query, or on the whole length bucket in the rare case
+    the trigram bound can't rule anything out.
+    """
+
+    GRAM = 3
+
+    def __init__(self):
+        self._guests = []                   # guest id -> Guest
+        self._terms = []                    # sorted, unique
+        self._postings = defaultdict(list)  # term -> guest ids
+        self._grams = defaultdict(list)     # (trigram, term length) -> terms
+        self._lengths = defaultdict(list)   # term length -> name terms
+
+    def __len__(self):
+        return len(self._guests)
+
+    @staticmethod
+    def _normalize(text):
+        return " ".join(str(text).strip().lower().split())
+
+    @staticmethod
+    def _phone_digits(text):
+        """Digits of `text` if it reads as a phone number, else ""."""
+        text = str(text)
+        if any(ch.isdigit() for ch in text) and set(text) <= _PHONE_CHARS:
+            return "".join(ch for ch in text if ch.isdigit())
+        return ""
+
+    def _guest_terms(self, guest):
+        """Return (all searchable terms, name terms that also get typo tolerance)."""
+        name = self._normalize(guest.name)
+        name_terms = {name, *name.split()}
+        terms = name_terms | {self._normalize(guest.email), self._normalize(guest.id_doc)}
+        phone = "".join(ch for ch in str(guest.phone_num) if ch.isdigit())
+        if phone:
+            terms.add(phone)
+            # Also without a country code (up to 4 digits with a "00" prefix), so the
+            # local number a clerk types still matches
+            terms.update(phone[i:] for i in range(1, 5) if len(phone) - i >= 7)
+        terms.discard("")
+        name_terms.discard("")
+        return terms, name_terms
+
+    def _grams_of(self, term):
+        padded = f"  {term} "
+        return {padded[i:i + self.GRAM] for i in range(len(padded) - self.GRAM + 1)}
+
+    def _index(self, guest, new_terms):
+        guest_id = len(self._guests)
+        self._guests.append(guest)
+        terms, name_terms = self._guest_terms(guest)
+        for term in terms:
+            if term not in self._postings:
+                new_terms.append(term)
+                if term in name_terms:
+                    self._lengths[len(term)].append(term)
+                    for gram in self._grams_of(term):
+                        self._grams[(gram, len(term))].append(term)
+            self._postings[term].append(guest_id)
+
+    def add(self, guest):
+        new_terms = []
+        self._index(guest, new_terms)
+        for term in new_terms:
+            bisect.insort(self._terms, term)
+
+    def add_many(self, guests):
+        """Bulk load, sorting the term list once instead of per insert."""
+        new_terms = []
+        for guest in guests:
+            self._index(guest, new_terms)
+        if new_terms:
+            self._terms.extend(new_terms)
+            self._terms.sort()
+
+    def _collect(self, terms, limit, seen=None):
+        seen = set() if seen is None else seen
+        results = []
+        for term in terms:
+            for guest_id in self._postings[term]:
+                if guest_id not in seen:
+                    seen.add(guest_id)
+                    results.append(self._guests[guest_id])
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def _prefix_terms(self, prefix):
+        i = bisect.bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            yield self._terms[i]
+            i += 1
+
+    def prefix(self, query, limit=10):
+        """Guests with any indexed field starting with `query` (autocomplete)."""
+        query = self._normalize(query)
+        if not query:
+            return []
+        terms = self._prefix_terms(query)
+        # Phones are stored as bare digits, so "(555) 123" must look for "555123" too
+        digits = self._phone_digits(query)
+        if digits and digits != query:
+            terms = chain(terms, self._prefix_terms(digits))
+        return self._collect(terms, limit)
+
+    @staticmethod
+    def _allowed_edits(query, max_distance):
+        # Two typos in a short name mostly match unrelated names, and below 8
+        # characters the trigram filter can't narrow a 2-edit search either
+        if len(query) <= 2:
+            return 0
+        if len(query) <= 7:
+            return min(1, max_distance)
+        return max_distance
+
+    def fuzzy(self, query, max_distance=2, limit=10):
+        """Guests whose name is within `max_distance` edits of `query`, closest first.
+
+        Short queries get fewer edits: none up to 2 characters, 1 up to 7.
+        """
+        query = self._normalize(query)
+        if not query:
+            return []
+        max_distance = self._allowed_edits(query, max_distance)
+        # Each edit destroys at most GRAM trigrams, so a match shares at least `needed`
+        # of them and must appear in one of the rarest len - needed + 1 posting lists
+        query_grams = self._grams_of(query)
+        needed = len(query_grams) - max_distance * self.GRAM
+        candidates = set()
+        for length in range(max(1, len(query) - max_distance), len(query) + max_distance + 1):
+            if needed <= 0:
+                # A match may share no trigram at all, so check every name of this length
+                candidates.update(self._lengths.get(length, ()))
+                continue
+            lists = sorted((self._grams.get((gram, length), ()) for gram in query_grams), key=len)
+            for terms in lists[:len(lists) - needed + 1]:
+                candidates.update(terms)
+
+        scored = []
+        for term in candidates:
+            # Set intersection in C is far cheaper than edit distance and drops most candidates
+            if needed > 0 and len(query_grams & self._grams_of(term)) < needed:
+                continue
+            distance = _edit_distance(query, term, max_distance)
+            if distance <= max_distance:
+                scored.append((distance, term))
+        scored.sort()
+        return self._collect((term for _, term in scored), limit)
+
+    def search(self, query, limit=10, max_distance=2):
+        """Prefix matches, falling back to typo-tolerant matches when there are none."""
+        return self.prefix(query, limit) or self.fuzzy(query, max_distance, limit)
@@ -1,18 +1,62 @@
 
-from room_management import HotelSystem
-from test2 import GuestRegistration, Reservation
+from events import EventBus
 from user_auth import AuthenticationSystem
 
 class IntegratedHotelSystem:
-    def __init__(self):
-        self.hotel_system = HotelSystem()
-        self.guest_system = GuestRegistration()
-        self.reservation_system = Reservation()
+    def __init__(self, config_path=None):
+        # Only what the login prompt needs is built here; the rest starts on first use
+        self.config_path = config_path
         self.auth_system = AuthenticationSystem()
+        self.event_bus = EventBus()
+        self._hotel_system = None
+        self._guest_system = None
+        self._reservation_system = None
+        self._rollups = None
+    
+    @property
+    def hotel_system(self):
+        if self._hotel_system is None:
+            from room_management import HotelSystem
+            self._hotel_system = HotelSystem(self.config_path)
+            self._hotel_system.set_event_bus(self.event_bus)
+        return self._hotel_system
+    
+    def _start_front_desk(self):
+        from rollups import RollupStore
+        from test2 import GuestRegistration, Reservation
+        
+        self._guest_system = GuestRegistration()
+        self._reservation_system = Reservation(self.config_path)
         
         # Connect the systems bidirectionally
-        self.reservation_system.set_guest_system(self.guest_system)
-        self.guest_system.set_reservation_system(self.reservation_system)
+        self._reservation_system.set_guest_system(self._guest_system)
+        self._guest_system.set_reservation_system(self._reservation_system)
+        
+        # Publish state changes for dashboards, metrics and persistence
+        self._guest_system.set_event_bus(self.event_bus)
+        self._reservation_system.set_event_bus(self.event_bus)
+        
+        # Keep occupancy/revenue trends up to date as events arrive
+        self._rollups = RollupStore(len(self._reservation_system.room_status))
+        self._rollups.attach(self.event_bus)
+    
+    @property
+    def guest_system(self):
+        if self._guest_system is None:
+            self._start_front_desk()
+        return self._guest_system
+    
+    @property
+    def reservation_system(self):
+        if self._reservation_system is None:
+            self._start_front_desk()
+        return self._reservation_system
+    
+    @property
+    def rollups(self):
+        if self._rollups is None:
+            self._start_front_desk()
+        return self._rollups
     
     def show_workflow_guide(self):
         print("\n=== Hotel System Workflow Guide ===")
@@ -22,6 +66,11 @@ class IntegratedHotelSystem:
         print("4. When ready, check out using your ID (option 5)")
         print("5. View revenue statistics (option 3)")
     
+    def run_night_audit(self):
+        from night_audit import NightAudit
+        audit = NightAudit(self.reservation_system, self.hotel_system)
+        audit.print_report(audit.run())
+    
     def show_main_menu(self):
         # Require login first
         if not self.auth_system.current_user:
@@ -40,9 +89,10 @@ class IntegratedHotelSystem:
             print("5. Check-out Guest")
             print("6. Show How To Use")
             print("7. Switch User")
-            print("8. Exit")
+            print("8. Run Night Audit")
+            print("9. Exit")
             
-            choice = input("Select option (1-8): ").strip()
+            choice = input("Select option (1-9): ").strip()
             
             if choice == "1":
                 if self.auth_system.require_permission('front_desk'):
@@ -67,11 +117,14 @@ class IntegratedHotelSystem:
                 if not self.auth_system.login():
                     break
             elif choice == "8":
+                if self.auth_system.require_permission('manager'):
+                    self.run_night_audit()
+            elif choice == "9":
                 self.auth_system.logout()
                 print("Exiting system. Goodbye!")
                 break
             else:
-                print("Invalid choice. Please enter 1-8.")
+                print("Invalid choice. Please enter 1-9.")
 
 if __name__ == "__main__":
     system = IntegratedHotelSystem()
@@ -0,0 +1,163 @@
+import json
+import os
+from datetime import date
+
+from snapshots import snapshot_reservations
+
+def _audit_chunk(stays, rates):
+    """Worker: price one chunk of (reservation_id, room_number, room_type) stays for one night."""
+    postings = []
+    for res_id, room_number, room_type in stays:
+        postings.append([res_id, room_number, room_type, rates[room_type]])
+    return postings
+
+class NightAudit:
+    """End-of-day job: posts a night's room charge to every active stay,
+    rolls up revenue by room type and reconciles room status between the
+    reservation desk and room management.
+
+    Stays are priced in chunks, inline by default: pricing is a rate lookup,
+    so a process pool (workers > 1, or None for one per CPU) mostly adds
+    pickling and only pays off if per-stay work grows. Each finished chunk is
+    appended to a checkpoint file, so an audit that crashes resumes with only
+    the stays it hadn't reached. Charges are posted to reservations once all
+    chunks are done, so a resumed audit never posts twice, and only charges
+    actually posted count towards the night's revenue.
+    """
+
+    def __init__(self, reservation_system, hotel_system=None,
+                 checkpoint_path="night_audit.checkpoint", chunk_size=5000, workers=1):
+        self.reservation_system = reservation_system
+        self.hotel_system = hotel_system
+        self.checkpoint_path = checkpoint_path
+        self.chunk_size = chunk_size
+        self.workers = workers  # 1 = run inline, None = one process per CPU
+
+    def _active_stays(self, audit_date):
+        snapshot = snapshot_reservations(self.reservation_system)
+        # Types and rates come from the desk's own config; spawned workers can't see which one that was
+        room_type_for = self.reservation_system.room_type_for
+        stays = [(res_id, record.room_number, room_type_for(record.room_number))
+                 for res_id, record in snapshot.reservations.items()
+                 if record.checkout_time is None and record.checkin_time.date() <= audit_date]
+        stays.sort()
+        return stays
+
+    # — Checkpointing ——————————————————————————————————————
+
+    def _load_checkpoint(self, audit_date):
+        """Return the postings of the chunks already finished for `audit_date`, one list per chunk.
+
+        A torn record left by the crash is cut off the file, so the next
+        append starts on a fresh line.
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return []
+        with open(self.checkpoint_path, "rb") as f:
+            lines = f.readlines()
+        records = []
+        valid_end = 0
+        for line in lines:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated record")
+                records.append(json.loads(line))
+            except ValueError:
+                break  # Torn write from the crash; that chunk is simply redone
+            valid_end += len(line)
+        if not records or records[0].get("audit_date") != audit_date.isoformat():
+            return []  # Left over from another day's audit
+        if valid_end < sum(len(line) for line in lines):
+            os.truncate(self.checkpoint_path, valid_end)
+        return [record["postings"] for record in records[1:]]
+
+    def _start_checkpoint(self, audit_date):
+        with open(self.checkpoint_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"audit_date": audit_date.isoformat()}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_checkpoint(self, f, postings):
+        f.write(json.dumps({"postings": postings}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    # — Audit ——————————————————————————————————————————————
+
+    def _process(self, chunks, on_done):
+        rates = self.reservation_system.room_rates
+        if self.workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                on_done(_audit_chunk(chunk, rates))
+            return
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_audit_chunk, chunk, rates) for chunk in chunks]
+            for future in as_completed(futures):
+                on_done(future.result())
+
+    def reconcile(self):
+        """Rooms whose occupancy differs between Reservation.room_status and room management."""
+        if self.hotel_system is None:
+            return []
+        managed = {room.room_number: room.is_occupied for room in self.hotel_system.rooms}
+        mismatches = []
+        for room_number in sorted(set(self.reservation_system.room_status) | set(managed)):
+            reserved = self.reservation_system.room_status.get(room_number)
+            flagged = managed.get(room_number)
+            if reserved != flagged:
+                mismatches.append((room_number, reserved, flagged))
+        return mismatches
+
+    def run(self, audit_date=None):
+        audit_date = audit_date or date.today()
+        done = self._load_checkpoint(audit_date)
+        resumed_chunks = len(done)
+        if not done:
+            self._start_checkpoint(audit_date)
+
+        posted = {posting[0] for postings in done for posting in postings}
+        pending = [stay for stay in self._active_stays(audit_date) if stay[0] not in posted]
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            def on_done(postings):
+                self._append_checkpoint(f, postings)
+                done.append(postings)
+            self._process(chunks, on_done)
+
+        revenue_by_type = {room_type: 0 for room_type in self.reservation_system.room_rates}
+        stays_posted = 0
+        for postings in done:
+            for res_id, _, room_type, rate in postings:
+                entry = self.reservation_system.reservations.get(res_id)
+                # A stay already charged for this date (e.g. a re-run) adds no revenue
+                if entry is not None and entry.post_charge(audit_date, rate):
+                    stays_posted += 1
+                    revenue_by_type[room_type] += rate
+
+        os.remove(self.checkpoint_path)
+        return {
+            "audit_date": audit_date,
+            "stays_posted": stays_posted,
+            "revenue_by_type": revenue_by_type,
+            "total_revenue": sum(revenue_by_type.values()),
+            "resumed_chunks": resumed_chunks,
+            "mismatches": self.reconcile(),
+        }
+
+    def print_report(self, report):
+        print(f"\n--- Night Audit {report['audit_date']:%Y-%m-%d} ---")
+        print(f"Stays charged: {report['stays_posted']:,}")
+        if report["resumed_chunks"]:
+            print(f"Resumed from checkpoint ({report['resumed_chunks']} chunks already done)")
+        print("Revenue by room type:")
+        for room_type, amount in report["revenue_by_type"].items():
+            print(f"  {room_type}: ${amount:,}")
+        print(f"Total room revenue: ${report['total_revenue']:,}")
+        if report["mismatches"]:
+            print("Room status mismatches (room, reservation desk, room management):")
+            for room_number, reserved, flagged in report["mismatches"]:
+                print(f"  Room {room_number}: {reserved} vs {flagged}")
+        else:
+            print("Room status reconciled: no mismatches.")
@@ -0,0 +1,59 @@
+import sys
+from itertools import islice
+
+class ReportRenderer:
+    """Writes report lines to the terminal in buffered chunks instead of one print() per line."""
+
+    def __init__(self, stream=None, page_size=40, chunk_size=500):
+        self.stream = stream          # None = whatever sys.stdout is at render time
+        self.page_size = page_size    # 0 disables pagination
+        self.chunk_size = chunk_size
+
+    def _output(self):
+        return self.stream if self.stream is not None else sys.stdout
+
+    def _is_interactive(self):
+        out = self._output()
+        return hasattr(out, "isatty") and out.isatty()
+
+    def render(self, lines, title=None):
+        """Write every line, flushing one joined block per chunk_size lines."""
+        out = self._output()
+        buffer = [title] if title is not None else []
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= self.chunk_size:
+                out.write("\n".join(buffer) + "\n")
+                buffer.clear()
+        if buffer:
+            out.write("\n".join(buffer) + "\n")
+        out.flush()
+
+    def paginate(self, lines, title=None):
+        """Render page by page, pausing between pages when attached to a terminal."""
+        if not self.page_size or not self._is_interactive():
+            self.render(lines, title)
+            return
+
+        it = iter(lines)
+        page = list(islice(it, self.page_size))
+        self.render(page, title)
+        while True:
+            page = list(islice(it, self.page_size))
+            if not page:
+                break
+            resp = input("-- More (Enter to continue, 'q' to stop) --").strip().lower()
+            if resp in ("q", "quit", "b", "back"):
+                break
+            self.render(page)
+
+    def export(self, lines, path, title=None):
+        """Stream lines to `path` without holding the whole report in memory. Returns line count."""
+        count = 0
+        with open(path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            if title is not None:
+                f.write(title.lstrip("\n") + "\n")
+            for line in lines:
+                f.write(line + "\n")
+                count += 1
+        return count
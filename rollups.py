@@ -0,0 +1,250 @@
+import heapq
+from datetime import datetime, timedelta
+
+from events import EventType
+
+# Bucket width in seconds per resolution
+RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+
+# How long each resolution is kept; None keeps it forever
+DEFAULT_RETENTION = {"minute": timedelta(days=2), "hour": timedelta(days=90), "day": None}
+
+METRICS = ("occupancy", "revenue", "adr", "revpar", "rooms_sold",
+           "check_ins", "check_outs", "service_requests")
+
+_EPOCH = datetime(1970, 1, 1)
+
+class Bucket:
+    __slots__ = ("occupancy_sum", "samples", "closing_occupancy", "rooms_sold", "revenue",
+                 "revenue_by_type", "check_ins", "check_outs", "service_requests")
+
+    def __init__(self):
+        self.occupancy_sum = 0.0
+        self.samples = 0
+        self.closing_occupancy = 0.0
+        self.rooms_sold = 0
+        self.revenue = 0
+        self.revenue_by_type = {}
+        self.check_ins = 0
+        self.check_outs = 0
+        self.service_requests = 0
+
+class RollupStore:
+    """Occupancy, ADR/RevPAR, revenue by room type and service volume at
+    minute, hour and day resolution.
+
+    Every sample is added to all three resolutions as it arrives, so coarse
+    buckets are always complete. Downsampling is then only a matter of
+    dropping fine buckets once they pass their retention, done each time a
+    new day bucket opens, which keeps trend queries to a walk over at most a
+    few hundred buckets.
+
+    Stays and revenue come from the reservation desk: only events carrying a
+    reservation_id count, so a second system publishing check-ins for the
+    same guest on the same bus doesn't double-count them. Each night of a
+    stay books one room-night at the rate known at check-in as the night
+    starts, so guests still in house count towards ADR and RevPAR. Check-out
+    only reconciles the stay against its final bill.
+    """
+
+    def __init__(self, total_rooms, retention=None):
+        self.total_rooms = total_rooms
+        self.retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        self.occupied = 0
+        self._buckets = {resolution: {} for resolution in RESOLUTIONS}
+        self._latest = _EPOCH
+        self._stays = {}  # reservation id -> [check-in time, room type, rate, nights booked, revenue booked]
+        self._due = []    # heap of (next night's start, reservation id)
+
+    # — Ingest ——————————————————————————————————————————————
+
+    @staticmethod
+    def _seconds(ts):
+        return int((ts - _EPOCH).total_seconds())
+
+    def _touch(self, ts):
+        """Buckets covering `ts` at every resolution still kept that far back."""
+        seconds = self._seconds(ts)
+        if ts > self._latest:
+            self._latest = ts
+        touched = []
+        new_day = False
+        for resolution, width in RESOLUTIONS.items():
+            keep = self.retention[resolution]
+            if keep is not None and ts < self._latest - keep:
+                continue  # Already downsampled past this point
+            key = seconds - seconds % width
+            buckets = self._buckets[resolution]
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = Bucket()
+                if resolution == "day":
+                    new_day = True
+            touched.append(bucket)
+        if new_day:
+            self.compact()
+        return touched
+
+    def _book(self, ts, room_type, revenue, room_nights=1):
+        for bucket in self._touch(ts):
+            bucket.rooms_sold += room_nights
+            bucket.revenue += revenue
+            if room_type:
+                bucket.revenue_by_type[room_type] = bucket.revenue_by_type.get(room_type, 0) + revenue
+
+    def _accrue(self, ts):
+        """Book every in-house night that has started by `ts`."""
+        while self._due and self._due[0][0] <= ts:
+            night_start, res_id = heapq.heappop(self._due)
+            stay = self._stays.get(res_id)
+            if stay is None:
+                continue  # Checked out since this night was queued
+            self._book(night_start, stay[1], stay[2])
+            stay[3] += 1
+            stay[4] += stay[2]
+            heapq.heappush(self._due, (night_start + timedelta(days=1), res_id))
+
+    def sample_occupancy(self, ts, occupied=None):
+        self._accrue(ts)
+        if occupied is not None:
+            self.occupied = occupied
+        rate = self.occupied / self.total_rooms if self.total_rooms else 0.0
+        for bucket in self._touch(ts):
+            bucket.occupancy_sum += rate
+            bucket.samples += 1
+            bucket.closing_occupancy = rate
+
+    def record_check_in(self, ts, reservation_id=None, room_type=None, rate=0):
+        self.occupied += 1
+        for bucket in self._touch(ts):
+            bucket.check_ins += 1
+        if reservation_id is not None and rate:
+            self._stays[reservation_id] = [ts, room_type, rate, 0, 0]
+            heapq.heappush(self._due, (ts, reservation_id))
+        self.sample_occupancy(ts)
+
+    def record_check_out(self, ts, room_type=None, nights=0, amount=0, checkin_time=None, reservation_id=None):
+        stay = self._stays.pop(reservation_id, None)
+        self.occupied = max(0, self.occupied - 1)
+        for bucket in self._touch(ts):
+            bucket.check_outs += 1
+        # Whatever the nightly accrual hasn't booked yet goes on the remaining nights
+        first_night = checkin_time or ts - timedelta(days=nights)
+        booked_nights, booked_revenue = (stay[3], stay[4]) if stay else (0, 0)
+        remaining, rest = nights - booked_nights, amount - booked_revenue
+        if remaining > 0:
+            nightly, remainder = divmod(rest, remaining)
+            for night in range(booked_nights, nights):
+                share = nightly + (remainder if night == nights - 1 else 0)
+                self._book(first_night + timedelta(days=night), room_type, share)
+        elif remaining or rest:
+            # Billed for fewer nights or a different amount than accrued; correct the last night
+            self._book(first_night + timedelta(days=max(booked_nights - 1, 0)), room_type, rest, remaining)
+        self.sample_occupancy(ts)
+
+    def record_service_request(self, ts):
+        self._accrue(ts)
+        for bucket in self._touch(ts):
+            bucket.service_requests += 1
+
+    def attach(self, event_bus):
+        event_bus.subscribe(self._on_event, [EventType.CHECK_IN, EventType.CHECK_OUT, EventType.SERVICE_DONE])
+
+    def _on_event(self, event):
+        data = event.data
+        if event.type == EventType.SERVICE_DONE:
+            self.record_service_request(event.timestamp)
+        elif "reservation_id" not in data:
+            return
+        elif event.type == EventType.CHECK_IN:
+            self.record_check_in(event.timestamp, data["reservation_id"], data.get("room_type"), data.get("rate", 0))
+        else:
+            self.record_check_out(event.timestamp, data.get("room_type"), data.get("nights", 0),
+                                  data.get("amount", 0), data.get("checkin_time"), data["reservation_id"])
+
+    def compact(self, now=None):
+        """Drop buckets older than their resolution's retention. Returns how many were dropped."""
+        now = now or self._latest
+        dropped = 0
+        for resolution, keep in self.retention.items():
+            if keep is None:
+                continue
+            cutoff = self._seconds(now - keep)
+            buckets = self._buckets[resolution]
+            # Stays are booked back onto earlier nights, so keys aren't in time order
+            expired = [key for key in buckets if key < cutoff]
+            for key in expired:
+                del buckets[key]
+            dropped += len(expired)
+        return dropped
+
+    # — Queries —————————————————————————————————————————————
+
+    def pick_resolution(self, start, end):
+        """Finest sensible resolution for the span that still has data back to `start`."""
+        span = end - start
+        if span <= timedelta(days=1):
+            preferred = "minute"
+        elif span <= timedelta(days=14):
+            preferred = "hour"
+        else:
+            preferred = "day"
+        order = list(RESOLUTIONS)
+        for resolution in order[order.index(preferred):]:
+            keep = self.retention[resolution]
+            if keep is None or start >= self._latest - keep:
+                return resolution
+        return order[-1]
+
+    def _value(self, bucket, metric, width):
+        if metric == "adr":
+            return bucket.revenue / bucket.rooms_sold if bucket.rooms_sold else 0.0
+        if metric == "revpar":
+            room_nights = self.total_rooms * width / RESOLUTIONS["day"]
+            return bucket.revenue / room_nights if room_nights else 0.0
+        if metric.startswith("revenue:"):
+            return bucket.revenue_by_type.get(metric.split(":", 1)[1], 0)
+        return getattr(bucket, metric)
+
+    def series(self, metric, start, end, resolution=None):
+        """(bucket start, value) pairs for `metric` over [start, end).
+
+        `metric` is one of METRICS or "revenue:<room type>". Buckets with no
+        activity are reported as zero.
+        """
+        if metric not in METRICS and not metric.startswith("revenue:"):
+            raise ValueError(f"Unknown metric: {metric}")
+        resolution = resolution or self.pick_resolution(start, end)
+        width = RESOLUTIONS[resolution]
+        buckets = self._buckets[resolution]
+        first = self._seconds(start) - self._seconds(start) % width
+        keys = range(first, self._seconds(end), width)
+        if metric == "occupancy":
+            return self._occupancy_series(buckets, keys, width)
+        empty = Bucket()
+        return [(_EPOCH + timedelta(seconds=key), self._value(buckets.get(key, empty), metric, width))
+                for key in keys]
+
+    def _occupancy_series(self, buckets, keys, width, lookback=1000):
+        # Occupancy holds between events, so quiet buckets carry the last known level
+        level = 0.0
+        for key in range(keys.start - width, keys.start - width * lookback, -width):
+            bucket = buckets.get(key)
+            if bucket is not None and bucket.samples:
+                level = bucket.closing_occupancy
+                break
+        points = []
+        for key in keys:
+            bucket = buckets.get(key)
+            if bucket is not None and bucket.samples:
+                points.append((_EPOCH + timedelta(seconds=key), bucket.occupancy_sum / bucket.samples))
+                level = bucket.closing_occupancy
+            else:
+                points.append((_EPOCH + timedelta(seconds=key), level))
+        return points
+
+    def trend(self, metric, period="week", end=None, resolution=None):
+        """Series for the week, month or year ending at `end` (default: latest data)."""
+        days = {"week": 7, "month": 30, "year": 365}[period]
+        end = end or self._latest + timedelta(seconds=1)
+        return self.series(metric, end - timedelta(days=days), end, resolution)
@@ -1,20 +1,29 @@
 from enum import Enum
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime, date, time, timedelta
 
+from availability_cache import AvailabilityCache
+from batch_assignment import BatchAssigner
+from events import EventType
+from rendering import ReportRenderer
+from room_inventory import LazyRoomMap, load_config
+from snapshots import ROOM_HISTORY, next_version, snapshot_rooms
+
 # ——— Reporting and Analytics —————————————————————————————————————
 
 class ReportGenerator:
     def __init__(self, hotel_system: 'HotelSystem', all_guests: List['Guest']):
         self.hotel_system = hotel_system
         self.all_guests = all_guests
+        self.renderer = ReportRenderer()
 
-    def generate_guest_demographics(self):
+    def _guest_demographics_lines(self) -> Iterator[str]:
         demographics = {"Male": 0, "Female": 0, "Other": 0}
         age_groups = {"<18": 0, "18–30": 0, "31–50": 0, "51+": 0}
 
-        for guest in self.all_guests:
+        # list() copies in one step, so registrations during the report don't disturb it
+        for guest in list(self.all_guests):
             gender = guest.gender.strip().capitalize()
             if gender not in demographics:
                 gender = "Other"
@@ -30,27 +39,28 @@ class ReportGenerator:
             else:
                 age_groups["51+"] += 1
 
-        print("\n--- Guest Demographics Report ---")
-        print("Gender Distribution:")
+        yield "\n--- Guest Demographics Report ---"
+        yield "Gender Distribution:"
         for gender, count in demographics.items():
-            print(f"  {gender}: {count}")
-        print("Age Groups:")
+            yield f"  {gender}: {count}"
+        yield "Age Groups:"
         for group, count in age_groups.items():
-            print(f"  {group}: {count}")
-
-    def generate_occupancy_report(self):
-        total_rooms = len(self.hotel_system.rooms)
-        occupied = sum(1 for room in self.hotel_system.rooms.values() if room.status == RoomStatus.OCCUPIED)
-        available = sum(1 for room in self.hotel_system.rooms.values() if room.status == RoomStatus.AVAILABLE)
-
-        print("\n--- Occupancy Report ---")
-        print(f"Total Rooms: {total_rooms}")
-        print(f"Occupied Rooms: {occupied}")
-        print(f"Available Rooms: {available}")
+            yield f"  {group}: {count}"
+
+    def _occupancy_lines(self, snapshot=None) -> Iterator[str]:
+        rooms = (snapshot or snapshot_rooms(self.hotel_system)).rooms
+        total_rooms = len(rooms)
+        occupied = sum(1 for room in rooms.values() if room.status == RoomStatus.OCCUPIED)
+        available = sum(1 for room in rooms.values() if room.status == RoomStatus.AVAILABLE)
+
+        yield "\n--- Occupancy Report ---"
+        yield f"Total Rooms: {total_rooms}"
+        yield f"Occupied Rooms: {occupied}"
+        yield f"Available Rooms: {available}"
         occupancy_rate = (occupied / total_rooms) * 100
-        print(f"Occupancy Rate: {occupancy_rate:.2f}%")
+        yield f"Occupancy Rate: {occupancy_rate:.2f}%"
 
-    def generate_revenue_projection(self):
+    def _revenue_projection_lines(self, snapshot=None) -> Iterator[str]:
         # Assume simple flat nightly rates (could be more complex later)
         rates = {
             RoomType.STANDARD: 100,
@@ -58,42 +68,90 @@ class ReportGenerator:
             RoomType.SUITE: 250
         }
         projected_revenue = 0
-        for room in self.hotel_system.rooms.values():
+        for room in (snapshot or snapshot_rooms(self.hotel_system)).rooms.values():
             if room.status == RoomStatus.OCCUPIED:
                 projected_revenue += rates[room.room_type]
 
-        print("\n--- Revenue Projection ---")
-        print(f"Projected Revenue (Current Occupancy): ${projected_revenue:.2f}")
+        yield "\n--- Revenue Projection ---"
+        yield f"Projected Revenue (Current Occupancy): ${projected_revenue:.2f}"
+
+    def _full_report_lines(self) -> Iterator[str]:
+        # One snapshot for every section, so the report describes a single moment
+        snapshot = snapshot_rooms(self.hotel_system)
+        yield from self._guest_demographics_lines()
+        yield from self._occupancy_lines(snapshot)
+        yield from self._revenue_projection_lines(snapshot)
+
+    def generate_guest_demographics(self):
+        self.renderer.render(self._guest_demographics_lines())
+
+    def generate_occupancy_report(self):
+        self.renderer.render(self._occupancy_lines())
+
+    def generate_revenue_projection(self):
+        self.renderer.render(self._revenue_projection_lines())
 
     def generate_full_report(self):
-        self.generate_guest_demographics()
-        self.generate_occupancy_report()
-        self.generate_revenue_projection()
+        self.renderer.render(self._full_report_lines())
+
+    def export_full_report(self, path: str) -> int:
+        """Stream the full report to `path`; returns the number of lines written."""
+        return self.renderer.export(self._full_report_lines(), path)
 
 # ——— Analytics Dashboard —————————————————————————————————————
 
 class AnalyticsDashboard:
     def __init__(self, hotel_system: 'HotelSystem'):
         self.hotel_system = hotel_system
+        self.renderer = ReportRenderer()
+        # Per-day counters kept current by the event feed once attached
+        self._daily_counts: Optional[Dict[date, Dict[EventType, int]]] = None
+
+    def attach(self, event_bus) -> None:
+        """Update check-in/out counters from pushed events instead of rescanning logs."""
+        self._daily_counts = {}
+        event_bus.subscribe(self._on_event, [EventType.CHECK_IN, EventType.CHECK_OUT])
+
+    def _on_event(self, event) -> None:
+        # The front desk publishes the same check-ins on a shared bus; count only our rooms'
+        if event.data.get("source") is not self.hotel_system:
+            return
+        counts = self._daily_counts.setdefault(event.timestamp.date(), {})
+        counts[event.type] = counts.get(event.type, 0) + 1
 
     def show_realtime_analytics(self):
         now = datetime.now()
-        check_in_times = [ts for ts, _, _ in self.hotel_system.logs["service"] if "check-in" in _.lower()]
-        check_out_times = [ts for ts, _, _ in self.hotel_system.logs["service"] if "check-out" in _.lower()]
+        today = date.today()
+        snapshot = snapshot_rooms(self.hotel_system)
 
         print("\n--- Real-Time Analytics Dashboard ---")
-        occupied = sum(1 for room in self.hotel_system.rooms.values() if room.status == RoomStatus.OCCUPIED)
-        total = len(self.hotel_system.rooms)
+        occupied = sum(1 for room in snapshot.rooms.values() if room.status == RoomStatus.OCCUPIED)
+        total = len(snapshot.rooms)
         print(f"[{now:%Y-%m-%d %H:%M}] Occupancy: {occupied}/{total} rooms")
 
         # Simple trend visualization (count of check-ins/outs today)
-        today = date.today()
-        check_ins_today = sum(1 for ts in check_in_times if ts.date() == today)
-        check_outs_today = sum(1 for ts in check_out_times if ts.date() == today)
+        if self._daily_counts is not None:
+            counts = self._daily_counts.get(today, {})
+            check_ins_today = counts.get(EventType.CHECK_IN, 0)
+            check_outs_today = counts.get(EventType.CHECK_OUT, 0)
+        else:
+            check_in_times = [ts for ts, _, _ in snapshot.logs["service"] if "check-in" in _.lower()]
+            check_out_times = [ts for ts, _, _ in snapshot.logs["service"] if "check-out" in _.lower()]
+            check_ins_today = sum(1 for ts in check_in_times if ts.date() == today)
+            check_outs_today = sum(1 for ts in check_out_times if ts.date() == today)
 
         print(f"Check-ins today: {check_ins_today}")
         print(f"Check-outs today: {check_outs_today}")
 
+    def show_trends(self, rollups, period: str = "week") -> None:
+        """Day-by-day occupancy, ADR, RevPAR and service volume from a rollups.RollupStore."""
+        metrics = ["occupancy", "adr", "revpar", "revenue", "service_requests"]
+        columns = [rollups.trend(metric, period, resolution="day") for metric in metrics]
+        lines = (f"{day:%Y-%m-%d}  {occ * 100:5.1f}%  ${adr:>10,.0f}  ${revpar:>10,.0f}  ${rev:>12,}  {svc:>5}"
+                 for (day, occ), (_, adr), (_, revpar), (_, rev), (_, svc) in zip(*columns))
+        self.renderer.paginate(lines, title=f"\n--- {period.title()} Trends ---\n"
+                                            f"Date        Occ.          ADR       RevPAR        Revenue  Svc")
+
 
 # ——— Domain Enums ———————————————————————————————————————————————
 
@@ -127,10 +185,35 @@ class Room:
             RoomType.DELUXE: ["TV", "Wi-Fi", "Mini-Bar"],
             RoomType.SUITE: ["TV", "Wi-Fi", "Mini-Bar", "Kitchenette"],
         }[room_type].copy()
+        self._status_history: List[tuple] = []  # (version, status), newest last
+        self._history_trimmed = False
         self.status = RoomStatus.AVAILABLE
         self.current_guest: Optional[Guest] = None
         self.cleaning_schedule: List[Dict[str, datetime]] = []
 
+    @property
+    def status(self) -> RoomStatus:
+        return self._status
+
+    @status.setter
+    def status(self, value: RoomStatus) -> None:
+        self._status = value
+        self._status_history.append((next_version(), value))
+        if len(self._status_history) > ROOM_HISTORY:
+            del self._status_history[0]
+            self._history_trimmed = True
+
+    def status_at(self, version: int) -> Optional[RoomStatus]:
+        """Status as of `version`, or None if that is older than the kept history."""
+        history = list(self._status_history)
+        for stamp, status in reversed(history):
+            if stamp <= version:
+                return status
+        # Until history is trimmed, the first entry is the state the room always started in
+        if history and not self._history_trimmed:
+            return history[0][1]
+        return None
+
     def is_available(self) -> bool:
         return self.status == RoomStatus.AVAILABLE
 
@@ -180,13 +263,14 @@ class CleaningTask(Task):
         logs["cleaning"].append((self._timestamp, self._room.number))
 
 class ServiceTask(Task):
-    def __init__(self, room: Room, request_type: str):
+    def __init__(self, room: Room, request_type: str, requested_at: Optional[datetime] = None):
         super().__init__(room)
         self._request_type = request_type
+        self._requested_at = requested_at
 
     def execute(self, logs: Dict[str, List]):
         self._room.status = RoomStatus.OCCUPIED
-        self._timestamp = datetime.now()
+        self._timestamp = self._requested_at or datetime.now()
         logs["service"].append((self._timestamp, self._room.number, self._request_type))
 
 # ——— Hotel System Controller ———————————————————————————————————————
@@ -194,20 +278,22 @@ class ServiceTask(Task):
 class HotelSystem:
     SERVICE_OPTIONS = ["New sheets/towels", "Mini bar restock", "Cleaning", "Other"]
 
-    def __init__(self):
-        # Initialize 30 rooms: 1–10 Standard, 11–20 Deluxe, 21–30 Suite
-        self.rooms: Dict[int, Room] = {
-            i: Room(i,
-                    RoomType.STANDARD if i <= 10 else
-                    RoomType.DELUXE if i <= 20 else
-                    RoomType.SUITE)
-            for i in range(1, 31)
-        }
+    def __init__(self, config_path: Optional[str] = None):
+        # Rooms come from the property config (by default 1–10 Standard, 11–20 Deluxe,
+        # 21–30 Suite) and are only built when first used
+        blocks = load_config(config_path)["service_room_blocks"]
+        self.rooms: LazyRoomMap = LazyRoomMap(blocks, lambda number, block: Room(number, RoomType(block.type)))
         self.inventory = Inventory()
         self.logs = {
             "cleaning": [],  # list of (timestamp, room_number)
             "service": []    # list of (timestamp, room_number, request_type)
         }
+        self.renderer = ReportRenderer()
+        self.event_bus = None
+        self.availability_cache = AvailabilityCache()
+
+    def set_event_bus(self, event_bus) -> None:
+        self.event_bus = event_bus
 
     def _get_yes_no(self, prompt: str) -> bool:
         while True:
@@ -248,15 +334,53 @@ class HotelSystem:
         if self._get_yes_no("Any upgrade or special request?"):
             self._submit_special_request()
 
-        # Assign first available room
-        for room in self.rooms.values():
-            if room.is_available() and room.room_type == chosen_type:
-                room.current_guest = Guest(name)
-                room.status = RoomStatus.OCCUPIED
-                print(f"Assigned Guest '{name}' to Room {room.number}")
-                return
-
-        print("No available rooms of that type.")
+        room = self.assign_room(name, chosen_type)
+        if room:
+            print(f"Assigned Guest '{name}' to Room {room.number}")
+        else:
+            print("No available rooms of that type.")
+
+    def assign_room(self, name: str, room_type: RoomType, timestamp: Optional[datetime] = None) -> Optional[Room]:
+        """Put `name` in the first available room of `room_type`, without prompting."""
+        for room in self.find_available_rooms(room_type):
+            # Re-check: the cache may be older than a change made outside this class
+            if room.is_available():
+                self.occupy_room(room, name, timestamp)
+                return room
+        return None
+
+    def find_available_rooms(self, room_type: Optional[RoomType] = None) -> tuple:
+        """Available rooms (optionally of one type), cached until a room of that type changes."""
+        return self.availability_cache.get(
+            "rooms", room_type.value if room_type else None, None, None,
+            lambda: (room for room in self.rooms.values()
+                     if room.is_available() and (room_type is None or room.room_type == room_type)))
+
+    def occupy_room(self, room: Room, name: str, timestamp: Optional[datetime] = None) -> None:
+        room.current_guest = Guest(name)
+        room.status = RoomStatus.OCCUPIED
+        self.availability_cache.invalidate(room.room_type.value)
+        if self.event_bus:
+            self.event_bus.emit(EventType.CHECK_IN, timestamp=timestamp, room_number=room.number,
+                                guest=name, room_type=room.room_type.value, source=self)
+
+    def assign_group(self, requests, timestamp: Optional[datetime] = None):
+        """Place a whole group (list of batch_assignment.GroupRequest) at once, keeping it on adjacent rooms."""
+        return BatchAssigner(self).assign(requests, timestamp)
+
+    def release_room(self, room_number: int, timestamp: Optional[datetime] = None) -> Optional[Room]:
+        """Check the current guest out of `room_number`. Returns None if it wasn't occupied."""
+        room = self.rooms.get(room_number)
+        if room is None or room.current_guest is None:
+            return None
+        guest = room.current_guest
+        room.current_guest = None
+        room.status = RoomStatus.AVAILABLE
+        self.availability_cache.invalidate(room.room_type.value)
+        if self.event_bus:
+            self.event_bus.emit(EventType.CHECK_OUT, timestamp=timestamp, room_number=room_number,
+                                guest=guest.name, room_type=room.room_type.value, source=self)
+        return room
 
     # — Simplified Special Request Handler —————————————————————————
 
@@ -270,18 +394,34 @@ class HotelSystem:
             return
 
         req_name = options[idx]
-        if self.inventory.allocate(req_name):
+        if self.allocate_request(req_name):
             print(f"Confirmed request for '{req_name}'.")
         else:
             print(f"'{req_name}' is unavailable.")
 
+    def allocate_request(self, req_name: str, timestamp: Optional[datetime] = None) -> bool:
+        if not self.inventory.allocate(req_name):
+            return False
+        if self.event_bus:
+            self.event_bus.emit(EventType.INVENTORY_ALLOCATED, timestamp=timestamp, item=req_name,
+                                remaining=self.inventory.count(req_name))
+        return True
+
     # — Cleaning Scheduler ——————————————————————————————————
 
-    def run_cleaning_cycle(self):
-        base = datetime.combine(date.today(), time(8, 0))
+    def schedule_cleaning(self, day: Optional[date] = None, room_numbers: Optional[set] = None):
+        base = datetime.combine(day or date.today(), time(8, 0))
         for i, room in self.rooms.items():
+            if room_numbers is not None and i not in room_numbers:
+                continue
             scheduled = base + timedelta(minutes=20 * (i - 1))
             CleaningTask(room, scheduled).execute(self.logs)
+            self.availability_cache.invalidate(room.room_type.value)
+            if self.event_bus:
+                self.event_bus.emit(EventType.CLEANING_DONE, timestamp=scheduled, room_number=room.number)
+
+    def run_cleaning_cycle(self):
+        self.schedule_cleaning()
         print("Cleaning cycle scheduled (8:00 start, 20 min intervals).")
 
     # — Room Service & Maintenance ————————————————————————————
@@ -292,25 +432,47 @@ class HotelSystem:
             return
         req = self.SERVICE_OPTIONS[idx]
 
-        resp = input("Room number (1–30): ").strip()
-        if not resp.isdigit() or not (1 <= int(resp) <= 30):
+        resp = input("Room number: ").strip()
+        if not resp.isdigit() or int(resp) not in self.rooms:
             print("Invalid room number.")
             return
         room_num = int(resp)
 
-        ServiceTask(self.rooms[room_num], req).execute(self.logs)
+        self.perform_service(room_num, req)
         print(f"Service '{req}' for Room {room_num} completed.")
 
+    def perform_service(self, room_num: int, req: str, timestamp: Optional[datetime] = None) -> bool:
+        room = self.rooms.get(room_num)
+        if room is None:
+            return False
+        ServiceTask(room, req, timestamp).execute(self.logs)
+        self.availability_cache.invalidate(room.room_type.value)
+        if self.event_bus:
+            self.event_bus.emit(EventType.SERVICE_DONE, timestamp=timestamp, room_number=room_num, request_type=req)
+        return True
+
     # — Logs Viewer ——————————————————————————————————————————
 
-    def view_logs(self):
-        print("\n-- Cleaning Log --")
+    def _log_lines(self) -> Iterator[str]:
+        yield "\n-- Cleaning Log --"
         for ts, rn in self.logs["cleaning"]:
-            print(f"  {ts:%H:%M} – Room {rn}")
-        print("\n-- Service Log --")
+            yield f"  {ts:%H:%M} – Room {rn}"
+        yield "\n-- Service Log --"
         for ts, rn, req in self.logs["service"]:
-            print(f"  {ts:%H:%M} – Room {rn}, {req}")
-        print()
+            yield f"  {ts:%H:%M} – Room {rn}, {req}"
+        yield ""
+
+    def view_logs(self):
+        self.renderer.paginate(self._log_lines())
+
+    def export_logs(self):
+        path = input("Export file path [hotel_logs.txt]: ").strip() or "hotel_logs.txt"
+        try:
+            count = self.renderer.export(self._log_lines(), path)
+        except OSError as e:
+            print(f"Could not write logs: {e}")
+            return
+        print(f"Exported {count} log lines to {path}")
 
     # — Main Menu —————————————————————————————————————————————
 
@@ -322,9 +484,10 @@ class HotelSystem:
                 "3. Run cleaning cycle\n"
                 "4. Service request\n"
                 "5. View logs\n"
-                "6. Exit"
+                "6. Export logs\n"
+                "7. Exit"
             )
-            choice = input("Select 1–6: ").strip()
+            choice = input("Select 1–7: ").strip()
             if choice == "1":
                 self.check_in_guest()
             elif choice == "2":
@@ -335,11 +498,13 @@ class HotelSystem:
                 self.handle_service_request()
             elif choice == "5":
                 self.view_logs()
-            elif choice in ("6", "b", "back"):
+            elif choice == "6":
+                self.export_logs()
+            elif choice in ("7", "b", "back"):
                 print("Goodbye!")
                 break
             else:
-                print("Enter a number between 1 and 6 (or 'back').")
+                print("Enter a number between 1 and 7 (or 'back').")
 
 if __name__ == "__main__":
     HotelSystem().run()
@@ -0,0 +1,160 @@
+"""Room inventory loaded from a compact, range-encoded property config.
+
+A config lists blocks of consecutively numbered rooms instead of every room:
+
+    {"room_blocks": [{"type": "Standard", "price": 17000, "first": 101, "count": 3}, ...],
+     "service_room_blocks": [{"type": "Standard", "first": 1, "count": 10}, ...]}
+
+"room_blocks" feeds the front desk and room management, "service_room_blocks"
+the housekeeping/service system. Room objects are only built when first used.
+"""
+import bisect
+import json
+import os
+from collections.abc import Mapping, Sequence
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hotel_config.json")
+
+# Built-in layout, used when no config file is present
+DEFAULT_CONFIG = {
+    "room_blocks": [
+        {"type": "Standard", "price": 17000, "first": 101, "count": 3},
+        {"type": "Deluxe", "price": 26000, "first": 201, "count": 3},
+        {"type": "Suite", "price": 35000, "first": 301, "count": 3},
+    ],
+    "service_room_blocks": [
+        {"type": "Standard", "first": 1, "count": 10},
+        {"type": "Deluxe", "first": 11, "count": 10},
+        {"type": "Suite", "first": 21, "count": 10},
+    ],
+}
+
+_loaded = {}
+
+class RoomBlock:
+    __slots__ = ("type", "price", "first", "count")
+
+    def __init__(self, type, first, count, price=None):
+        self.type = type
+        self.price = price
+        self.first = first
+        self.count = count
+
+class BlockIndex:
+    """Maps room numbers and positions to blocks with a binary search."""
+
+    def __init__(self, blocks):
+        self.blocks = sorted(blocks, key=lambda b: b.first)
+        self._firsts = [b.first for b in self.blocks]
+        self._offsets = []
+        total = 0
+        for block in self.blocks:
+            self._offsets.append(total)
+            total += block.count
+        self.total = total
+
+    def block_for(self, number):
+        i = bisect.bisect_right(self._firsts, number) - 1
+        if i >= 0 and number < self.blocks[i].first + self.blocks[i].count:
+            return self.blocks[i]
+        return None
+
+    def type_of(self, number):
+        """Room type of `number` (int or numeric string), or None if it isn't configured."""
+        try:
+            block = self.block_for(int(number))
+        except ValueError:
+            return None
+        return block.type if block else None
+
+    def rates(self):
+        """Nightly rate per room type, in room-number order of the types' first blocks."""
+        rates = {}
+        for block in self.blocks:
+            if rates.setdefault(block.type, block.price) != block.price:
+                raise ValueError(f"Conflicting prices for room type {block.type} in the config")
+        return rates
+
+    def number_at(self, position):
+        i = bisect.bisect_right(self._offsets, position) - 1
+        block = self.blocks[i]
+        return block.first + position - self._offsets[i], block
+
+    def numbers(self):
+        for block in self.blocks:
+            yield from range(block.first, block.first + block.count)
+
+def load_config(path=None):
+    """Return {"room_blocks": BlockIndex, "service_room_blocks": BlockIndex}, read once per path.
+
+    The path defaults to $HOTEL_CONFIG, then hotel_config.json next to this
+    module, then the built-in layout.
+    """
+    path = path or os.environ.get("HOTEL_CONFIG") or DEFAULT_CONFIG_PATH
+    if path not in _loaded:
+        raw = dict(DEFAULT_CONFIG)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                raw.update(json.load(f))
+        _loaded[path] = {name: BlockIndex(RoomBlock(**block) for block in raw[name])
+                         for name in ("room_blocks", "service_room_blocks")}
+    return _loaded[path]
+
+class _LazyRooms:
+    def __init__(self, index, make_room):
+        self._index = index
+        self._make_room = make_room  # (number, block) -> room
+        self._rooms = {}
+
+    def _room(self, number, block):
+        room = self._rooms.get(number)
+        if room is None:
+            room = self._rooms[number] = self._make_room(number, block)
+        return room
+
+    def __len__(self):
+        return self._index.total
+
+class LazyRoomList(_LazyRooms, Sequence):
+    """List-like rooms (position order), built on first access."""
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("room index out of range")
+        return self._room(*self._index.number_at(position))
+
+    def __iter__(self):
+        for block in self._index.blocks:
+            for number in range(block.first, block.first + block.count):
+                yield self._room(number, block)
+
+    def find(self, number):
+        """Room with this number, or None. Only that room is built."""
+        try:
+            number = int(number)
+        except ValueError:
+            return None
+        block = self._index.block_for(number)
+        return self._room(number, block) if block else None
+
+class LazyRoomMap(_LazyRooms, Mapping):
+    """Dict-like rooms keyed by room number, built on first access."""
+
+    def __getitem__(self, number):
+        block = self._index.block_for(number) if isinstance(number, int) else None
+        if block is None:
+            raise KeyError(number)
+        return self._room(number, block)
+
+    def __iter__(self):
+        return self._index.numbers()
+
+    def __contains__(self, number):
+        return isinstance(number, int) and self._index.block_for(number) is not None
+
+    def copy(self):
+        return dict(self.items())
@@ -1,4 +1,9 @@
 # room_management.py
+from availability_cache import AvailabilityCache
+from events import EventType
+from rendering import ReportRenderer
+from room_inventory import LazyRoomList, load_config
+
 class Room:
     def __init__(self, room_number, room_type, price):
         self.room_number = room_number
@@ -8,45 +13,66 @@ class Room:
         self.requires_cleaning = False
         self.maintenance_needed = False
 
+    def __setattr__(self, name, value):
+        # Any change to the room drops the cached display line
+        if name != "_info_line":
+            self.__dict__["_info_line"] = None
+        object.__setattr__(self, name, value)
+
     def display_info(self):
-        status = "Occupied" if self.is_occupied else "Available"
-        cleaning = "Needs cleaning" if self.requires_cleaning else "Clean"
-        maintenance = "Needs maintenance" if self.maintenance_needed else "Good condition"
-        return f"Room {self.room_number} ({self.room_type}) - ${self.price}/night - {status}, {cleaning}, {maintenance}"
+        if self._info_line is None:
+            status = "Occupied" if self.is_occupied else "Available"
+            cleaning = "Needs cleaning" if self.requires_cleaning else "Clean"
+            maintenance = "Needs maintenance" if self.maintenance_needed else "Good condition"
+            self._info_line = f"Room {self.room_number} ({self.room_type}) - ${self.price}/night - {status}, {cleaning}, {maintenance}"
+        return self._info_line
 
 class HotelSystem:
-    def __init__(self):
-        self.rooms = []
+    def __init__(self, config_path=None):
+        self.config_path = config_path
+        self.renderer = ReportRenderer()
+        self.event_bus = None
+        self.availability_cache = AvailabilityCache()
         self._initialize_rooms()
     
+    def set_event_bus(self, event_bus):
+        self.event_bus = event_bus
+    
     def _initialize_rooms(self):
-        # Standard rooms
-        for i in range(101, 104):
-            self.rooms.append(Room(str(i), "Standard", 17000))
-        
-        # Deluxe rooms
-        for i in range(201, 204):
-            self.rooms.append(Room(str(i), "Deluxe", 26000))
-        
-        # Suite rooms
-        for i in range(301, 304):
-            self.rooms.append(Room(str(i), "Suite", 35000))
+        # Rooms come from the property config and are only built when first used
+        blocks = load_config(self.config_path)["room_blocks"]
+        self.rooms = LazyRoomList(blocks, lambda number, block: Room(str(number), block.type, block.price))
     
     def view_all_rooms(self):
-        print("\n--- All Rooms ---")
-        for room in self.rooms:
-            print(room.display_info())
+        self.renderer.paginate((room.display_info() for room in self.rooms),
+                               title="\n--- All Rooms ---")
+    
+    def find_available_rooms(self, room_type=None):
+        """Unoccupied rooms (optionally of one type), cached until a room's occupancy changes."""
+        return self.availability_cache.get(
+            "rooms", room_type, None, None,
+            lambda: (room for room in self.rooms
+                     if not room.is_occupied and (room_type is None or room.room_type == room_type)))
     
     def view_available_rooms(self):
-        print("\n--- Available Rooms ---")
-        available = [room for room in self.rooms if not room.is_occupied]
+        available = [room.display_info() for room in self.find_available_rooms()]
         
         if not available:
+            print("\n--- Available Rooms ---")
             print("No rooms available at the moment.")
             return
         
-        for room in available:
-            print(room.display_info())
+        self.renderer.paginate(available, title="\n--- Available Rooms ---")
+    
+    def export_rooms(self):
+        path = input("Export file path [rooms_report.txt]: ").strip() or "rooms_report.txt"
+        try:
+            count = self.renderer.export((room.display_info() for room in self.rooms), path,
+                                         title="--- All Rooms ---")
+        except OSError as e:
+            print(f"Could not write report: {e}")
+            return
+        print(f"Exported {count} rooms to {path}")
     
     def set_room_status(self):
         room_number = input("Enter room number: ")
@@ -68,22 +94,34 @@ class HotelSystem:
         choice = input("Select option (1-3): ")
         
         if choice == "1":
-            room.is_occupied = not room.is_occupied
+            self.update_room_status(room_number, "is_occupied", not room.is_occupied)
             print(f"Room {room_number} is now {'occupied' if room.is_occupied else 'available'}")
         elif choice == "2":
-            room.requires_cleaning = not room.requires_cleaning
+            self.update_room_status(room_number, "requires_cleaning", not room.requires_cleaning)
             print(f"Room {room_number} {'needs cleaning' if room.requires_cleaning else 'is clean'}")
         elif choice == "3":
-            room.maintenance_needed = not room.maintenance_needed
+            self.update_room_status(room_number, "maintenance_needed", not room.maintenance_needed)
             print(f"Room {room_number} {'needs maintenance' if room.maintenance_needed else 'is in good condition'}")
         else:
             print("Invalid choice")
     
+    def update_room_status(self, room_number, field, value, timestamp=None):
+        """Set one status flag without prompting. Returns the room, or None if unknown."""
+        if field not in ("is_occupied", "requires_cleaning", "maintenance_needed"):
+            raise ValueError(f"Unknown room status field: {field}")
+        room = self._find_room(room_number)
+        if not room:
+            return None
+        setattr(room, field, value)
+        if field == "is_occupied":
+            self.availability_cache.invalidate(room.room_type)
+        if self.event_bus:
+            self.event_bus.emit(EventType.ROOM_STATUS_CHANGED, timestamp=timestamp,
+                                room_number=room_number, field=field, value=value)
+        return room
+    
     def _find_room(self, room_number):
-        for room in self.rooms:
-            if room.room_number == room_number:
-                return room
-        return None
+        return self.rooms.find(room_number)
     
     def run(self, user_role):
         while True:
@@ -94,8 +132,9 @@ class HotelSystem:
             # Only managers and front desk can update room status
             if user_role in ['manager', 'front_desk']:
                 print("3. Update room status")
-                print("4. Return to main menu")
-                max_choice = 4
+                print("4. Export room report")
+                print("5. Return to main menu")
+                max_choice = 5
             else:
                 print("3. Return to main menu")
                 max_choice = 3
@@ -106,8 +145,10 @@ class HotelSystem:
                 self.view_all_rooms()
             elif choice == "2":
                 self.view_available_rooms()
-            elif choice == "3" and max_choice == 4:
+            elif choice == "3" and max_choice == 5:
                 self.set_room_status()
+            elif choice == "4" and max_choice == 5:
+                self.export_rooms()
             elif choice == str(max_choice):
                 return
             else:
@@ -0,0 +1,215 @@
+import argparse
+import heapq
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from room_management import HotelSystem
+from string_system import load_string_system
+from test2 import Guest, GuestRegistration, Reservation
+
+DEFAULT_STAY_NIGHTS = {1: 0.30, 2: 0.25, 3: 0.20, 5: 0.15, 7: 0.10}
+DEFAULT_ROOM_MIX = {"Standard": 0.5, "Deluxe": 0.3, "Suite": 0.2}
+
+class TrafficSimulator:
+    """Drives every subsystem with synthetic guest traffic at simulated time.
+
+    Arrivals are a Poisson process, stay lengths and room types are drawn from
+    weighted tables, and every random draw comes from one seeded generator, so
+    the same seed always replays the same sequence of operations.
+    """
+
+    def __init__(self, seed=0, arrivals_per_hour=0.5, stay_nights=None, room_mix=None,
+                 service_requests_per_night=1.0, special_request_rate=0.2,
+                 start=None, event_bus=None, record_trace=False, config_path=None):
+        self.rng = random.Random(seed)
+        self.arrivals_per_hour = arrivals_per_hour
+        self.stay_nights = stay_nights or DEFAULT_STAY_NIGHTS
+        self.room_mix = room_mix or DEFAULT_ROOM_MIX
+        self.service_requests_per_night = service_requests_per_night
+        self.special_request_rate = special_request_rate
+        # A fixed default start keeps timestamps identical between runs
+        self.start = start or datetime(2025, 1, 1, 0, 0)
+        self.trace = [] if record_trace else None
+
+        self.guest_system = GuestRegistration()
+        # Size the property from a room config (see room_inventory.py); None = the default layout
+        self.reservation_system = Reservation(config_path)
+        self.reservation_system.set_guest_system(self.guest_system)
+        self.guest_system.set_reservation_system(self.reservation_system)
+        self.room_system = HotelSystem(config_path)
+        self.string_module = load_string_system()
+        self.service_system = self.string_module.HotelSystem(config_path)
+        if event_bus:
+            for system in (self.guest_system, self.reservation_system, self.room_system, self.service_system):
+                system.set_event_bus(event_bus)
+
+        self.stats = {
+            "registrations": 0,
+            "check_ins": 0,
+            "check_outs": 0,
+            "turned_away": 0,
+            "service_requests": 0,
+            "special_requests_granted": 0,
+            "special_requests_denied": 0,
+            "cleaning_cycles": 0,
+            "rooms_cleaned": 0,
+            "peak_occupancy": 0,
+        }
+        self._queue = []
+        self._seq = 0
+        self._guest_count = 0
+        self._stays = {}          # reservation id -> service-system room number (or None)
+        self._dirty_rooms = []    # room numbers checked out since the last cleaning cycle
+
+    # — Scheduling helpers ——————————————————————————————————
+
+    def _schedule(self, when, kind, payload=None):
+        self._seq += 1
+        heapq.heappush(self._queue, (when, self._seq, kind, payload))
+
+    def _record(self, when, kind, detail):
+        if self.trace is not None:
+            self.trace.append((when, kind, detail))
+
+    def _poisson(self, mean):
+        # Knuth's method; the means used here are small
+        limit, k, p = math.exp(-mean), 0, 1.0
+        while True:
+            p *= self.rng.random()
+            if p <= limit:
+                return k
+            k += 1
+
+    def _weighted(self, table):
+        return self.rng.choices(list(table), weights=list(table.values()))[0]
+
+    def _free_room(self, room_type):
+        free = self.reservation_system.find_available_rooms(room_type)
+        return free[0][0] if free else None
+
+    # — Event handlers ——————————————————————————————————————
+
+    def _new_guest(self):
+        self._guest_count += 1
+        n = self._guest_count
+        return Guest(f"Sim Guest {n:06d}",
+                     self.rng.randint(18, 85),
+                     self.rng.choice(["M", "F"]),
+                     f"555{self.rng.randint(0, 9999999):07d}",
+                     f"guest{n:06d}@example.com",
+                     f"SIM{n:08d}")
+
+    def _arrival(self, now):
+        self._schedule(now + timedelta(hours=self.rng.expovariate(self.arrivals_per_hour)), "arrival")
+
+        guest = self._new_guest()
+        self.guest_system.add_guest(guest, now)
+        self.stats["registrations"] += 1
+
+        room_type = self._weighted(self.room_mix)
+        nights = self._weighted(self.stay_nights)
+        room_number = self._free_room(room_type)
+        if room_number is None:
+            self.stats["turned_away"] += 1
+            self._record(now, "turned_away", room_type)
+            return
+
+        reservation = self.reservation_system.reserve_room(guest, room_number, now)
+        self.room_system.update_room_status(room_number, "is_occupied", True, now)
+        service_room = self.service_system.assign_room(guest.name, self.string_module.RoomType(room_type), now)
+        self._stays[reservation.reservation_id] = service_room.number if service_room else None
+        self.stats["check_ins"] += 1
+        self._record(now, "check_in", room_number)
+
+        occupied = sum(1 for taken in self.reservation_system.room_status.values() if taken)
+        self.stats["peak_occupancy"] = max(self.stats["peak_occupancy"], occupied)
+
+        if self.rng.random() < self.special_request_rate:
+            item = self.rng.choice(self.service_system.inventory.options())
+            if self.service_system.allocate_request(item, now):
+                self.stats["special_requests_granted"] += 1
+            else:
+                self.stats["special_requests_denied"] += 1
+
+        stay = timedelta(days=nights)
+        for _ in range(self._poisson(self.service_requests_per_night * nights)):
+            self._schedule(now + stay * self.rng.random(), "service", reservation.reservation_id)
+        self._schedule(now + stay, "departure", reservation.reservation_id)
+
+    def _departure(self, now, res_id):
+        reservation = self.reservation_system.release_reservation(res_id, now)
+        if reservation is None:
+            return
+        self.room_system.update_room_status(reservation.room_number, "is_occupied", False, now)
+        self.room_system.update_room_status(reservation.room_number, "requires_cleaning", True, now)
+        service_room = self._stays.pop(res_id)
+        if service_room is not None:
+            self.service_system.release_room(service_room, now)
+        self._dirty_rooms.append(reservation.room_number)
+        self.stats["check_outs"] += 1
+        self._record(now, "check_out", reservation.room_number)
+
+    def _service(self, now, res_id):
+        service_room = self._stays.get(res_id)
+        if service_room is None:
+            return
+        request = self.rng.choice(self.service_system.SERVICE_OPTIONS)
+        self.service_system.perform_service(service_room, request, now)
+        self.stats["service_requests"] += 1
+        self._record(now, "service", (service_room, request))
+
+    def _cleaning(self, now):
+        self._schedule(now + timedelta(days=1), "cleaning")
+        dirty, self._dirty_rooms = self._dirty_rooms, []
+        for room_number in dirty:
+            self.room_system.update_room_status(room_number, "requires_cleaning", False, now)
+        # Only vacant rooms are cleaned; occupied ones would otherwise be freed
+        vacant = {n for n, room in self.service_system.rooms.items() if room.current_guest is None}
+        self.service_system.schedule_cleaning(now.date(), vacant)
+        self.stats["cleaning_cycles"] += 1
+        self.stats["rooms_cleaned"] += len(dirty)
+        self._record(now, "cleaning", len(dirty))
+
+    # — Driver ——————————————————————————————————————————————
+
+    def run(self, days):
+        """Simulate `days` days of traffic and return the stats, including wall-clock throughput."""
+        end = self.start + timedelta(days=days)
+        self._schedule(self.start + timedelta(hours=self.rng.expovariate(self.arrivals_per_hour)), "arrival")
+        self._schedule(self.start.replace(hour=8, minute=0), "cleaning")
+
+        handlers = {
+            "arrival": lambda now, _: self._arrival(now),
+            "departure": self._departure,
+            "service": self._service,
+            "cleaning": lambda now, _: self._cleaning(now),
+        }
+        operations = 0
+        started = time.perf_counter()
+        while self._queue and self._queue[0][0] <= end:
+            now, _, kind, payload = heapq.heappop(self._queue)
+            handlers[kind](now, payload)
+            operations += 1
+        elapsed = time.perf_counter() - started
+
+        self.stats["simulated_days"] = days
+        self.stats["operations"] = operations
+        self.stats["wall_seconds"] = elapsed
+        self.stats["operations_per_second"] = operations / elapsed if elapsed else 0.0
+        return self.stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic hotel traffic for capacity testing.")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--arrivals-per-hour", type=float, default=0.5)
+    parser.add_argument("--service-per-night", type=float, default=1.0)
+    parser.add_argument("--config", help="room config to simulate (default: hotel_config.json / $HOTEL_CONFIG)")
+    args = parser.parse_args()
+
+    simulator = TrafficSimulator(seed=args.seed, arrivals_per_hour=args.arrivals_per_hour,
+                                 service_requests_per_night=args.service_per_night, config_path=args.config)
+    for key, value in simulator.run(args.days).items():
+        print(f"{key}: {value:,.2f}" if isinstance(value, float) else f"{key}: {value:,}")
@@ -0,0 +1,82 @@
+"""Point-in-time, lock-free views of hotel state for long-running reports.
+
+Writers stamp every change with a version from one global clock. A snapshot
+takes a version of its own and keeps only what was visible at that version,
+so reports work on a stable copy while check-ins and check-outs carry on.
+"""
+import itertools
+from datetime import datetime
+
+_clock = itertools.count(1)
+
+# How many past statuses each room remembers for snapshots taken mid-update
+ROOM_HISTORY = 8
+
+def next_version():
+    # next() on itertools.count is a single C call, so stamps are unique across threads
+    return next(_clock)
+
+class ReservationRecord:
+    __slots__ = ("reservation_id", "guest", "room_number", "checkin_time", "checkout_time")
+
+    def __init__(self, reservation_id, guest, room_number, checkin_time, checkout_time):
+        self.reservation_id = reservation_id
+        self.guest = guest
+        self.room_number = room_number
+        self.checkin_time = checkin_time
+        self.checkout_time = checkout_time
+
+class RoomRecord:
+    __slots__ = ("number", "room_type", "capacity", "status")
+
+    def __init__(self, number, room_type, capacity, status):
+        self.number = number
+        self.room_type = room_type
+        self.capacity = capacity
+        self.status = status
+
+class ReservationSnapshot:
+    def __init__(self, version, reservations, room_status):
+        self.version = version
+        self.taken_at = datetime.now()
+        self.reservations = reservations  # reservation id -> ReservationRecord
+        self.room_status = room_status
+
+class HotelSnapshot:
+    def __init__(self, version, rooms, logs):
+        self.version = version
+        self.taken_at = datetime.now()
+        self.rooms = rooms  # room number -> RoomRecord
+        self.logs = logs
+
+def snapshot_reservations(reservation_system):
+    """Reservations and room_status of a test2.Reservation as of now."""
+    version = next_version()
+    # dict.copy() runs without releasing the GIL, so it can't see a half-applied insert
+    live = reservation_system.reservations.copy()
+    room_status = reservation_system.room_status.copy()
+    records = {}
+    for res_id, entry in live.items():
+        if entry.created_version > version:
+            continue
+        # Read the stamp before the time; check_out() writes them in the opposite order
+        checkout_version = entry.checkout_version
+        visible = checkout_version is not None and checkout_version <= version
+        records[res_id] = ReservationRecord(res_id, entry.guest, entry.room_number, entry.checkin_time,
+                                            entry.checkout_time if visible else None)
+    return ReservationSnapshot(version, records, room_status)
+
+def snapshot_rooms(hotel_system, attempts=5):
+    """Rooms and logs of a string-module HotelSystem as of now."""
+    for _ in range(attempts):
+        version = next_version()
+        rooms = {}
+        for number, room in hotel_system.rooms.copy().items():
+            status = room.status_at(version)
+            if status is None:
+                break  # The room changed too often while we copied; retry at a newer version
+            rooms[number] = RoomRecord(number, room.room_type, room.capacity, status)
+        else:
+            logs = {name: list(entries) for name, entries in hotel_system.logs.items()}
+            return HotelSnapshot(version, rooms, logs)
+    raise RuntimeError("Could not take a consistent room snapshot; rooms are changing too fast")
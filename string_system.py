@@ -0,0 +1,17 @@
+"""Import shim for "room management string.py", whose filename isn't a valid module name."""
+import importlib.util
+import os
+import sys
+
+MODULE_NAME = "room_management_string"
+_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "room management string.py")
+
+def load_string_system():
+    """Import the module once and return it (later calls reuse sys.modules)."""
+    if MODULE_NAME in sys.modules:
+        return sys.modules[MODULE_NAME]
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, _PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[MODULE_NAME] = module
+    spec.loader.exec_module(module)
+    return module
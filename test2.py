@@ -2,6 +2,12 @@
 import uuid
 from datetime import datetime
 
+from availability_cache import AvailabilityCache
+from events import EventType
+from guest_search import GuestSearchIndex
+from room_inventory import load_config
+from snapshots import next_version, snapshot_reservations
+
 class Guest:
     def __init__(self, name, age, gender, phone_num, email, id_doc):
         self.name = name
@@ -18,11 +24,16 @@ class GuestRegistration:
     def __init__(self):
         self.registered_guests = set()
         self.all_guests = []
+        self.search_index = GuestSearchIndex()
         self.reservation_system = None  # Will be set by IntegratedHotelSystem
+        self.event_bus = None
     
     def set_reservation_system(self, reservation_system):
         self.reservation_system = reservation_system
     
+    def set_event_bus(self, event_bus):
+        self.event_bus = event_bus
+    
     def register_guest(self):
         print("\n--- Hotel Guest Registration ---")
         name = input("Enter your name: ")
@@ -35,11 +46,9 @@ class GuestRegistration:
         temp_guest = Guest(name, age, gender, phone_num, email, id_doc)
         uid = temp_guest.unique_id()
 
-        if uid in self.registered_guests:
+        if not self.add_guest(temp_guest):
             print("Duplicate entry: A guest with the same name and ID already exists.")
         else:
-            self.registered_guests.add(uid)
-            self.all_guests.append(temp_guest)
             print(f"\nGuest Registered: {temp_guest.name}")
             print(f"Details: Age {temp_guest.age}, Gender {temp_guest.gender}, "
                   f"Phone {temp_guest.phone_num}, Email {temp_guest.email}, ID {temp_guest.id_doc}")
@@ -49,6 +58,18 @@ class GuestRegistration:
         
         return temp_guest
     
+    def add_guest(self, guest, timestamp=None):
+        """Register `guest` without prompting. Returns False for a duplicate."""
+        uid = guest.unique_id()
+        if uid in self.registered_guests:
+            return False
+        self.registered_guests.add(uid)
+        self.all_guests.append(guest)
+        self.search_index.add(guest)
+        if self.event_bus:
+            self.event_bus.emit(EventType.GUEST_REGISTERED, timestamp=timestamp, guest_id=uid, name=guest.name)
+        return True
+    
     def find_guest(self, name, id_doc):
         uid = f"{name.strip().lower()}-{id_doc.strip().lower()}"
         for guest in self.all_guests:
@@ -56,6 +77,10 @@ class GuestRegistration:
                 return guest
         return None
     
+    def search_guests(self, query, limit=10):
+        """Prefix and typo-tolerant lookup by name, email, phone or ID document."""
+        return self.search_index.search(query, limit)
+    
     def show_stats(self):
         print("\n--- Guest Statistics ---")
         print(f"Total registered guests: {len(self.all_guests)}")
@@ -86,115 +111,165 @@ class GuestRegistration:
             
         print("\n--- Revenue Statistics ---")
         
+        # Work on a point-in-time copy so check-ins can carry on meanwhile
+        snapshot = snapshot_reservations(self.reservation_system)
+        
         # Calculate total revenue from completed reservations
         total_revenue = 0
         completed_count = 0
         active_count = 0
         
         # Room type statistics
-        standard_count = 0
-        deluxe_count = 0
-        suite_count = 0
+        room_type_for = self.reservation_system.room_type_for
+        room_counts = dict.fromkeys(self.reservation_system.room_rates, 0)
+        revenue_by_type = dict.fromkeys(self.reservation_system.room_rates, 0)
         
-        for res_id, reservation in self.reservation_system.reservations.items():
+        for res_id, reservation in snapshot.reservations.items():
+            room_type = room_type_for(reservation.room_number)
+            room_counts[room_type] += 1
             # Only count completed (checked out) reservations for revenue
             if reservation.checkout_time is not None:
                 completed_count += 1
-                room_num = reservation.room_number
-                
-                # Calculate room rate based on room number
-                if room_num.startswith("1"):  # Standard room
-                    rate = 17000
-                    standard_count += 1
-                elif room_num.startswith("2"):  # Deluxe room
-                    rate = 26000
-                    deluxe_count += 1
-                else:  # Suite or other
-                    rate = 35000
-                    suite_count += 1
-                
-                # Calculate nights stayed (at least 1)
-                check_in = reservation.checkin_time
-                check_out = reservation.checkout_time
-                nights = max(1, (check_out - check_in).days + (1 if (check_out - check_in).seconds > 0 else 0))
-                
-                # Add to total revenue
-                reservation_revenue = nights * rate
+                # A checked-out stay no longer changes, so the live entry can price it
+                _, _, reservation_revenue = self.reservation_system.reservations[res_id].total_charge()
                 total_revenue += reservation_revenue
+                revenue_by_type[room_type] += reservation_revenue
             else:
                 active_count += 1
-                # Count room types for active reservations too
-                room_num = reservation.room_number
-                if room_num.startswith("1"):
-                    standard_count += 1
-                elif room_num.startswith("2"):
-                    deluxe_count += 1
-                else:
-                    suite_count += 1
         
         # Display revenue information
         print(f"Total revenue: ${total_revenue:,}")
         print(f"Completed reservations: {completed_count}")
         print(f"Active reservations: {active_count}")
-        print(f"Total reservations: {len(self.reservation_system.reservations)}")
+        print(f"Total reservations: {len(snapshot.reservations)}")
         
         # Room type distribution
         print("\nRoom usage:")
-        print(f"Standard rooms: {standard_count}")
-        print(f"Deluxe rooms: {deluxe_count}")
-        print(f"Suite rooms: {suite_count}")
-        
-        # Revenue by room type (estimate based on room rates)
-        standard_revenue = standard_count * 17000
-        deluxe_revenue = deluxe_count * 26000
-        suite_revenue = suite_count * 35000
+        for room_type, count in room_counts.items():
+            print(f"{room_type} rooms: {count}")
         
         print("\nRevenue by room type (completed reservations only):")
         if completed_count > 0:
-            print(f"Standard rooms: ${standard_revenue:,} ({standard_revenue/total_revenue*100:.1f}%)")
-            print(f"Deluxe rooms: ${deluxe_revenue:,} ({deluxe_revenue/total_revenue*100:.1f}%)")
-            print(f"Suite rooms: ${suite_revenue:,} ({suite_revenue/total_revenue*100:.1f}%)")
+            for room_type, revenue in revenue_by_type.items():
+                print(f"{room_type} rooms: ${revenue:,} ({revenue/total_revenue*100:.1f}%)")
         else:
             print("No completed reservations yet.")
 
 class ReservationEntry:
-    def __init__(self, guest, room_number):
+    def __init__(self, guest, room_number, room_type, rate, checkin_time=None):
         self.reservation_id = str(uuid.uuid4())[:8]
         self.guest = guest
         self.room_number = room_number
-        self.checkin_time = datetime.now()
+        self.room_type = room_type
+        self.rate = rate  # Nightly rate from the config at check-in
+        self.checkin_time = checkin_time or datetime.now()
         self.checkout_time = None
         self.paid = False
+        self.charges = []  # (date, amount) posted by the night audit
+        # Version stamps that decide what a snapshot (see snapshots.py) can see
+        self.created_version = next_version()
+        self.checkout_version = None
 
-    def check_out(self):
-        self.checkout_time = datetime.now()
+    def post_charge(self, charge_date, amount):
+        """Post one night's room charge; posting the same date twice is a no-op."""
+        if any(posted == charge_date for posted, _ in self.charges):
+            return False
+        self.charges.append((charge_date, amount))
+        return True
+
+    def check_out(self, checkout_time=None):
+        self.checkout_time = checkout_time or datetime.now()
         self.paid = True
+        self.checkout_version = next_version()  # Last, so snapshots never see a half check-out
 
-    def get_invoice(self):
+    def total_charge(self):
+        """Return (nights, nightly rate, total) for a checked-out stay.
+
+        Nights the night audit posted are billed as posted; only the nights it
+        hasn't reached are priced here.
+        """
         # Calculate nights stayed (at least 1)
         check_in = self.checkin_time
         check_out = self.checkout_time
         nights = max(1, (check_out - check_in).days + (1 if (check_out - check_in).seconds > 0 else 0))
         
-        if self.room_number.startswith("1"):
-            rate = 17000  # Standard
-        elif self.room_number.startswith("2"):
-            rate = 26000  # Deluxe
-        else:
-            rate = 35000  # Suite/Other
-        total = nights * rate
+        posted = sum(amount for _, amount in self.charges)
+        unposted = max(0, nights - len(self.charges))
+        return max(nights, len(self.charges)), self.rate, posted + unposted * self.rate
+
+    def get_invoice(self):
+        nights, rate, total = self.total_charge()
         return f"Room {self.room_number} (${rate:,}/night) x {nights} night{'s' if nights > 1 else ''} = ${total:,}"
 
 class Reservation:
-    def __init__(self):
-        self.available_rooms = ["101", "102", "103", "201", "202", "203", "301", "302", "303"]
-        self.room_status = {room: False for room in self.available_rooms}  # False = Available
+    def __init__(self, config_path=None):
+        self.blocks = load_config(config_path)["room_blocks"]
+        self.room_rates = self.blocks.rates()
+        self.available_rooms = [str(number) for number in self.blocks.numbers()]
+        self.room_status = dict.fromkeys(self.available_rooms, False)  # False = Available
         self.reservations = {}
         self.guest_system = None  # Will be set by IntegratedHotelSystem
+        self.event_bus = None
+        self.availability_cache = AvailabilityCache()
     
     def set_guest_system(self, guest_system):
         self.guest_system = guest_system
     
+    def room_type_for(self, room_number):
+        """Room type of `room_number` in this desk's config, or None if it has no such room."""
+        return self.blocks.type_of(room_number)
+    
+    def set_event_bus(self, event_bus):
+        self.event_bus = event_bus
+    
+    def reserve_room(self, guest, room_number, checkin_time=None):
+        """Check `guest` into `room_number` without prompting. Returns None if the room is taken."""
+        if self.room_status.get(room_number, True):
+            return None
+        room_type = self.room_type_for(room_number)
+        reservation = ReservationEntry(guest, room_number, room_type, self.room_rates[room_type], checkin_time)
+        while reservation.reservation_id in self.reservations:
+            # Short IDs do collide at audit scale; never overwrite another stay
+            reservation.reservation_id = str(uuid.uuid4())[:8]
+        self.reservations[reservation.reservation_id] = reservation
+        self.room_status[room_number] = True
+        self.availability_cache.invalidate(reservation.room_type)
+        if self.event_bus:
+            self.event_bus.emit(EventType.CHECK_IN, timestamp=reservation.checkin_time,
+                                reservation_id=reservation.reservation_id, room_number=room_number,
+                                guest=guest.name, room_type=reservation.room_type, rate=reservation.rate)
+        return reservation
+    
+    def release_reservation(self, res_id, checkout_time=None):
+        """Check out reservation `res_id` without prompting. Returns None if it isn't active."""
+        reservation = self.reservations.get(res_id)
+        if reservation is None or reservation.checkout_time is not None:
+            return None
+        reservation.check_out(checkout_time)
+        self.room_status[reservation.room_number] = False
+        self.availability_cache.invalidate(reservation.room_type)
+        if self.event_bus:
+            nights, _, total = reservation.total_charge()
+            self.event_bus.emit(EventType.CHECK_OUT, timestamp=reservation.checkout_time,
+                                reservation_id=res_id, room_number=reservation.room_number,
+                                guest=reservation.guest.name, room_type=reservation.room_type,
+                                checkin_time=reservation.checkin_time, nights=nights, amount=total)
+        return reservation
+    
+    def find_available_rooms(self, room_type=None, start=None, end=None):
+        """Rooms free right now as (room_number, nightly rate, total for start..end).
+
+        This is current availability only; rooms carry no booking calendar, so
+        start/end just price the stay. The free list is cached per room type.
+        """
+        def compute():
+            for room, occupied in self.room_status.items():
+                if not occupied and (room_type is None or self.room_type_for(room) == room_type):
+                    yield (room, self.room_rates[self.room_type_for(room)])
+        nights = max(1, (end - start).days) if start and end else 1
+        free = self.availability_cache.get("rooms", room_type, None, None, compute)
+        return tuple((room, rate, rate * nights) for room, rate in free)
+    
     def list_active_reservations(self):
         """List all active reservations to help users find their reservation ID."""
         if not self.reservations:
@@ -226,23 +301,22 @@ class Reservation:
         
         if guest is None:
             print("Guest not found. Please register first using option 1.")
+            suggestions = self.guest_system.search_guests(name, limit=5)
+            if suggestions:
+                # Names only: the ID document is what proves identity at check-in
+                print("Did you mean:")
+                for match in suggestions:
+                    print(f"  {match.name}")
             return
 
         # Display room categories
         print("\nAvailable rooms:")
-        print("Standard ($17,000/night): ", end="")
-        standard = [r for r in ["101", "102", "103"] if not self.room_status.get(r, True)]
-        print(", ".join(standard) if standard else "None available")
-        
-        print("Deluxe ($26,000/night): ", end="")
-        deluxe = [r for r in ["201", "202", "203"] if not self.room_status.get(r, True)]
-        print(", ".join(deluxe) if deluxe else "None available")
-        
-        print("Suite ($35,000/night): ", end="")
-        suite = [r for r in ["301", "302", "303"] if not self.room_status.get(r, True)]
-        print(", ".join(suite) if suite else "None available")
+        for room_type, rate in self.room_rates.items():
+            print(f"{room_type} (${rate:,}/night): ", end="")
+            rooms = [room for room, _, _ in self.find_available_rooms(room_type)]
+            print(", ".join(rooms) if rooms else "None available")
 
-        available = [r for r, status in self.room_status.items() if not status]
+        available = [room for room, _, _ in self.find_available_rooms()]
         if not available:
             print("No rooms available.")
             return
@@ -252,9 +326,7 @@ class Reservation:
             print(" Invalid room selection.")
             return
 
-        reservation = ReservationEntry(guest, selected)
-        self.reservations[reservation.reservation_id] = reservation
-        self.room_status[selected] = True
+        reservation = self.reserve_room(guest, selected)
 
         print(f"\n Check-in Successful! Reservation ID: {reservation.reservation_id}")
         print(f"Room {selected} assigned. Check-in time: {reservation.checkin_time.strftime('%Y-%m-%d %H:%M')}")
@@ -280,8 +352,7 @@ class Reservation:
             print(f"This reservation has already been checked out on {reservation.checkout_time.strftime('%Y-%m-%d %H:%M')}.")
             return
             
-        reservation.check_out()
-        self.room_status[reservation.room_number] = False
+        self.release_reservation(res_id)
 
         print(f"\n Check-out Successful for {reservation.guest.name}")
         print(f"Room: {reservation.room_number}")